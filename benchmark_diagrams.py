@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Diagram benchmark suite: synthetic AWS/Azure/GCP Terraform at scale
+
+Times TerraformParser and every DiagramGenerator / AdvancedDiagramGenerator
+format in-process (with tracemalloc peak memory from a separate traced run),
+and, as a secondary end-to-end measurement, every format through the API.
+Results are written as JSON and compared against a stored baseline; the
+script exits non-zero when a timing regresses past the tolerance.
+
+Usage:
+    python benchmark_diagrams.py                      # 10/100/1k/10k, all providers
+    python benchmark_diagrams.py --sizes 10 100 --no-api
+    python benchmark_diagrams.py --update-baseline    # store current run as baseline
+
+Results go to benchmarks/results.json (git-ignored); the baseline lives in
+benchmarks/baseline.json. A partial run is compared only against the
+matching cases of the baseline, and --update-baseline merges into it.
+"""
+
+import argparse
+import inspect
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+API_BASE = "http://localhost:8001/api/v1"
+DIAGRAM_TYPES = ["ascii", "mermaid", "json", "svg", "lucidchart", "html", "png"]
+PROVIDERS = ["aws", "azure", "gcp"]
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+BENCHMARK_DIR = Path(__file__).resolve().parent / "benchmarks"
+
+# Resource templates per provider, cycled to reach the requested count.
+# Every template references the shared network so connection inference
+# has realistic work to do.
+TEMPLATES = {
+    "aws": {
+        "header": '''provider "aws" {
+  region = "us-east-1"
+}
+
+resource "aws_vpc" "main" {
+  cidr_block = "10.0.0.0/16"
+}
+''',
+        "resources": [
+            '''resource "aws_subnet" "subnet_{i}" {{
+  vpc_id     = aws_vpc.main.id
+  cidr_block = "10.{a}.{b}.0/24"
+}}
+''',
+            '''resource "aws_instance" "web_{i}" {{
+  ami           = "ami-0c55b159cbfafe1f0"
+  instance_type = "t3.medium"
+  tags = {{
+    Name = "web-{i}"
+  }}
+}}
+''',
+            '''resource "aws_db_instance" "db_{i}" {{
+  identifier        = "db-{i}"
+  engine            = "mysql"
+  instance_class    = "db.t3.micro"
+  allocated_storage = 20
+}}
+''',
+            '''resource "aws_s3_bucket" "bucket_{i}" {{
+  bucket = "app-bucket-{i}"
+}}
+''',
+            '''resource "aws_security_group" "sg_{i}" {{
+  name   = "sg-{i}"
+  vpc_id = aws_vpc.main.id
+}}
+''',
+        ],
+    },
+    "azure": {
+        "header": '''provider "azurerm" {
+  features {}
+}
+
+resource "azurerm_resource_group" "main" {
+  name     = "bench-rg"
+  location = "eastus"
+}
+
+resource "azurerm_virtual_network" "main" {
+  name                = "bench-vnet"
+  address_space       = ["10.0.0.0/16"]
+  location            = azurerm_resource_group.main.location
+  resource_group_name = azurerm_resource_group.main.name
+}
+''',
+        "resources": [
+            '''resource "azurerm_subnet" "subnet_{i}" {{
+  name                 = "subnet-{i}"
+  resource_group_name  = azurerm_resource_group.main.name
+  virtual_network_name = azurerm_virtual_network.main.name
+  address_prefixes     = ["10.{a}.{b}.0/24"]
+}}
+''',
+            '''resource "azurerm_linux_virtual_machine" "vm_{i}" {{
+  name                = "vm-{i}"
+  location            = azurerm_resource_group.main.location
+  resource_group_name = azurerm_resource_group.main.name
+  size                = "Standard_D2s_v3"
+}}
+''',
+            '''resource "azurerm_mssql_database" "db_{i}" {{
+  name     = "db-{i}"
+  sku_name = "S0"
+}}
+''',
+            '''resource "azurerm_storage_account" "sa_{i}" {{
+  name                     = "benchsa{i}"
+  location                 = azurerm_resource_group.main.location
+  resource_group_name      = azurerm_resource_group.main.name
+  account_tier             = "Standard"
+  account_replication_type = "LRS"
+}}
+''',
+            '''resource "azurerm_network_security_group" "nsg_{i}" {{
+  name                = "nsg-{i}"
+  location            = azurerm_resource_group.main.location
+  resource_group_name = azurerm_resource_group.main.name
+}}
+''',
+        ],
+    },
+    "gcp": {
+        "header": '''provider "google" {
+  project = "bench-project"
+  region  = "us-central1"
+}
+
+resource "google_compute_network" "main" {
+  name = "bench-network"
+}
+''',
+        "resources": [
+            '''resource "google_compute_subnetwork" "subnet_{i}" {{
+  name          = "subnet-{i}"
+  network       = google_compute_network.main.id
+  ip_cidr_range = "10.{a}.{b}.0/24"
+}}
+''',
+            '''resource "google_compute_instance" "vm_{i}" {{
+  name         = "vm-{i}"
+  machine_type = "e2-medium"
+  zone         = "us-central1-a"
+}}
+''',
+            '''resource "google_sql_database_instance" "db_{i}" {{
+  name             = "db-{i}"
+  database_version = "POSTGRES_14"
+}}
+''',
+            '''resource "google_storage_bucket" "bucket_{i}" {{
+  name     = "bench-bucket-{i}"
+  location = "US"
+}}
+''',
+            '''resource "google_compute_firewall" "fw_{i}" {{
+  name    = "fw-{i}"
+  network = google_compute_network.main.name
+}}
+''',
+        ],
+    },
+}
+
+
+def generate_terraform(provider: str, count: int) -> str:
+    """Generate synthetic Terraform with `count` resources for a provider"""
+    template = TEMPLATES[provider]
+    blocks = [template["header"]]
+    resources = template["resources"]
+    for i in range(count):
+        blocks.append(resources[i % len(resources)].format(i=i, a=(i // 256) % 256, b=i % 256))
+    return "\n".join(blocks)
+
+
+def _measure(func, runs: int):
+    """Time func over `runs` untraced runs, then trace one more for peak memory
+
+    Returns (median seconds, peak bytes, last result). Timings are taken with
+    tracemalloc off because tracing slows allocation-heavy code unevenly.
+    """
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak, result
+
+
+def _diagram_methods(generator) -> dict:
+    """Public generate_* methods of a generator that need no arguments"""
+    methods = {}
+    for name, method in inspect.getmembers(generator, inspect.ismethod):
+        if not name.startswith("generate_"):
+            continue
+        params = inspect.signature(method).parameters.values()
+        if all(p.default is not p.empty or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in params):
+            methods[name[len("generate_"):]] = method
+    return methods
+
+
+def benchmark_in_process(terraform_code: str, runs: int) -> dict:
+    """Time TerraformParser and every DiagramGenerator/AdvancedDiagramGenerator format"""
+    from diagram_generator import TerraformParser, DiagramGenerator
+    from diagram_image_generator import AdvancedDiagramGenerator
+
+    results = {}
+    seconds, peak, parser = _measure(lambda: TerraformParser(terraform_code), runs)
+    results["parse"] = {"seconds": seconds, "peak_bytes": peak, "resources": len(parser.resources)}
+
+    for label, generator_class in (("diagram", DiagramGenerator), ("advanced", AdvancedDiagramGenerator)):
+        for name, method in _diagram_methods(generator_class(parser)).items():
+            try:
+                seconds, peak, content = _measure(method, runs)
+            except Exception as e:
+                print(f"   ⚠️  {generator_class.__name__}.generate_{name}: {e}")
+                results[f"{label}_{name}"] = {"error": str(e)}
+                continue
+            size = len(content) if isinstance(content, (str, bytes)) else len(json.dumps(content, default=str))
+            results[f"{label}_{name}"] = {"seconds": seconds, "peak_bytes": peak, "bytes": size}
+    return results
+
+
+def benchmark_api(terraform_code: str, runs: int, timeout: int) -> dict:
+    """Time every diagram format through /diagram/generate-diagram"""
+    import requests
+
+    results = {}
+    for diagram_type in DIAGRAM_TYPES:
+        timings = []
+        size = 0
+        error = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            try:
+                response = requests.post(
+                    f"{API_BASE}/diagram/generate-diagram",
+                    json={"terraform_code": terraform_code, "diagram_type": diagram_type},
+                    timeout=timeout
+                )
+            except requests.RequestException as e:
+                error = str(e)
+                break
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                error = response.status_code
+                break
+            size = len(response.content)
+        if error is not None:
+            print(f"   ⚠️  {diagram_type}: API request failed ({error})")
+            results[f"api_{diagram_type}"] = {"error": error}
+            continue
+        results[f"api_{diagram_type}"] = {"seconds": statistics.median(timings), "bytes": size}
+    return results
+
+
+def api_available() -> bool:
+    """Check whether the backend API is reachable (requests must be installed)"""
+    import requests
+
+    try:
+        requests.get(API_BASE.rsplit("/api/", 1)[0] + "/", timeout=3)
+        return True
+    except requests.RequestException:
+        return False
+
+
+def _metric_group(name: str) -> str:
+    """Which measurement path produced a metric: api or in_process"""
+    return "api" if name.startswith("api_") else "in_process"
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float, min_delta: float,
+                        groups: set) -> list:
+    """Return regressions against the baseline for the cases and groups measured
+
+    Only cases present in results and metrics from the attempted groups
+    ("in_process", "api") are compared, so a run limited by --sizes,
+    --providers or --no-api is checked against the matching slice of a full
+    baseline. A metric regresses when it is slower than baseline by more than
+    tolerance and by more than min_delta seconds, or when it was attempted
+    but produced no timing (e.g. an error).
+    """
+    regressions = []
+    for case, metrics in results.items():
+        for name, expected in baseline.get(case, {}).items():
+            if "seconds" not in expected or _metric_group(name) not in groups:
+                continue
+            expected_ms = expected["seconds"] * 1000
+            current = metrics.get(name)
+            if current is None or "seconds" not in current:
+                reason = f"error {current['error']}" if current and "error" in current else "not measured"
+                regressions.append(f"{case} {name}: no timing ({reason}), baseline {expected_ms:.2f} ms")
+                continue
+            current_ms = current["seconds"] * 1000
+            limit_ms = expected_ms * (1 + tolerance)
+            if current_ms > limit_ms and current_ms - expected_ms > min_delta * 1000:
+                regressions.append(
+                    f"{case} {name}: {current_ms:.2f} ms > {limit_ms:.2f} ms "
+                    f"(baseline {expected_ms:.2f} ms)"
+                )
+    return regressions
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", type=_positive_int, nargs="+", default=DEFAULT_SIZES)
+    arg_parser.add_argument("--providers", nargs="+", choices=PROVIDERS, default=PROVIDERS)
+    arg_parser.add_argument("--runs", type=_positive_int, default=3, help="runs per case (median is kept)")
+    arg_parser.add_argument("--output", default=str(BENCHMARK_DIR / "results.json"))
+    arg_parser.add_argument("--baseline", default=str(BENCHMARK_DIR / "baseline.json"))
+    arg_parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="allowed slowdown vs baseline, as a fraction")
+    arg_parser.add_argument("--min-delta", type=float, default=5.0,
+                            help="ignore slowdowns smaller than this many ms (timer noise)")
+    arg_parser.add_argument("--update-baseline", action="store_true")
+    arg_parser.add_argument("--no-api", action="store_true", help="skip API format timings")
+    arg_parser.add_argument("--timeout", type=_positive_int, default=300, help="API request timeout (s)")
+    args = arg_parser.parse_args()
+
+    print("=" * 70)
+    print("DIAGRAM BENCHMARK SUITE")
+    print("=" * 70)
+
+    try:
+        import diagram_generator  # noqa: F401
+        import diagram_image_generator  # noqa: F401
+        in_process = True
+    except ImportError as e:
+        print(f"⚠️  Backend not importable ({e}); skipping in-process timings")
+        in_process = False
+
+    use_api = False
+    if not args.no_api:
+        try:
+            use_api = api_available()
+            if not use_api:
+                print(f"⚠️  API not reachable at {API_BASE}; skipping format timings")
+        except ImportError:
+            print("⚠️  'requests' is not installed; skipping API format timings")
+
+    groups = {group for group, enabled in (("in_process", in_process), ("api", use_api)) if enabled}
+
+    results = {}
+    for provider in args.providers:
+        for size in args.sizes:
+            case = f"{provider}_{size}"
+            terraform_code = generate_terraform(provider, size)
+            print(f"\n[{case}] {len(terraform_code):,} bytes of Terraform")
+
+            metrics = {}
+            if in_process:
+                metrics.update(benchmark_in_process(terraform_code, args.runs))
+            if use_api:
+                metrics.update(benchmark_api(terraform_code, args.runs, args.timeout))
+
+            for name, values in metrics.items():
+                if "seconds" in values:
+                    peak = f", peak {values['peak_bytes'] / 1024:,.0f} KiB" if "peak_bytes" in values else ""
+                    print(f"   {name:<44} {values['seconds'] * 1000:>10.1f} ms{peak}")
+            results[case] = metrics
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\n✓ Results written to {args.output}")
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        if not any("seconds" in values for metrics in results.values() for values in metrics.values()):
+            print("❌ No case produced timings; refusing to write an empty baseline")
+            return 1
+        # Merge so a partial run only refreshes the cases and metrics it measured
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        for case, metrics in results.items():
+            baseline.setdefault(case, {}).update(
+                {name: values for name, values in metrics.items() if "seconds" in values}
+            )
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baseline, indent=2), encoding="utf-8")
+        print(f"✓ Baseline updated: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"⚠️  No baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+
+    regressions = compare_to_baseline(results, json.loads(baseline_path.read_text(encoding="utf-8")),
+                                      args.tolerance, args.min_delta / 1000, groups)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) vs baseline:")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print("\n✅ No regressions vs baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
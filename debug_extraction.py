@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
-"""Debug terraform value extraction"""
+"""Debug terraform value extraction
+
+Runs the backend's regex-based _extract_terraform_value (simulated below)
+side by side with a prototype symbol-table resolver, so their results can
+be compared on the same Terraform.
+"""
 import sys
 import re
+from typing import Optional
+
 
 # Simulate the extraction function
 def _extract_terraform_value(terraform_code: str, reference: str):
@@ -67,8 +74,239 @@ def _extract_terraform_value(terraform_code: str, reference: str):
     
     return None
 
+
+# Prototype: one-pass symbol table resolver
+HEADER_PATTERN = re.compile(r'^\s*(resource|data|variable|locals)\s*((?:"[^"]*"\s*)*)$')
+ATTRIBUTE_PATTERN = re.compile(r'^([\w-]+)\s*=(?!=)\s*(.+)$', re.DOTALL)
+HEREDOC_PATTERN = re.compile(r'<<-?([A-Za-z_]\w*)[ \t]*\n')
+REFERENCE_PATTERN = re.compile(r'^[A-Za-z_][\w-]*(\.[\w-]+)+$')
+INTERPOLATION_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+
+def _template_end(text: str, i: int) -> int:
+    """Index just past the `}` closing a ${...} template opened before i"""
+    depth = 1
+    while i < len(text):
+        ch = text[i]
+        if ch == '"':
+            i = _string_end(text, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _string_end(text: str, i: int) -> int:
+    """Index just past the quoted string starting at text[i]"""
+    i += 1
+    while i < len(text):
+        ch = text[i]
+        if ch == '\\':
+            i += 2
+        elif ch == '"':
+            return i + 1
+        elif ch == '\n':
+            return i  # unterminated; HCL strings cannot span lines
+        elif text.startswith('${', i) or text.startswith('%{', i):
+            i = _template_end(text, i + 2)
+        else:
+            i += 1
+    return i
+
+
+def _store(symbols: dict, prefix: str, statement: str):
+    """Record a `key = value` statement of a top-level block"""
+    attribute = ATTRIBUTE_PATTERN.match(statement.strip())
+    if not attribute:
+        return
+    key, value = attribute.group(1), attribute.group(2).strip()
+
+    # Quoted strings are literals; anything else is an expression
+    is_literal = (len(value) >= 2 and value.startswith('"') and value.endswith('"')
+                  and _string_end(value, 0) == len(value))
+    if is_literal:
+        value = value[1:-1]
+
+    if prefix.startswith('var.'):
+        if key == 'default':
+            symbols[prefix] = (value, is_literal)
+    else:
+        symbols[prefix + key] = (value, is_literal)
+
+
+def _build_symbol_table(terraform_code: str) -> dict:
+    """Collect type.name.attribute, data.*, var.* and local.* values in one pass
+
+    Values are stored as (value, is_literal); is_literal is True for quoted
+    strings, which are never followed as references.
+    """
+    text = terraform_code
+    symbols = {}
+    depth = 0       # open { [ ( count
+    prefix = None   # symbol prefix of the enclosing top-level block
+    header = []     # text before a top-level `{`
+    statement = []  # text of the current attribute inside a top-level block
+    i = 0
+
+    while i < len(text):
+        ch = text[i]
+
+        # Comments and heredocs are skipped or copied whole
+        if ch == '#' or text.startswith('//', i):
+            end = text.find('\n', i)
+            i = len(text) if end < 0 else end
+            continue
+        if text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = len(text) if end < 0 else end + 2
+            continue
+        if ch == '<' and depth:
+            heredoc = HEREDOC_PATTERN.match(text, i)
+            if heredoc:
+                marker = re.compile(rf'^[ \t]*{heredoc.group(1)}[ \t]*$', re.MULTILINE)
+                end = marker.search(text, heredoc.end())
+                end = len(text) if not end else end.end()
+                statement.append(text[i:end])
+                i = end
+                continue
+
+        if ch == '"':
+            end = _string_end(text, i)
+            (statement if depth else header).append(text[i:end])
+            i = end
+            continue
+
+        if depth == 0:
+            if ch == '{':
+                match = HEADER_PATTERN.match(''.join(header))
+                labels = re.findall(r'"([^"]*)"', match.group(2)) if match else []
+                kind = match.group(1) if match else None
+                if kind == 'resource' and len(labels) == 2:
+                    prefix = f"{labels[0]}.{labels[1]}."
+                elif kind == 'data' and len(labels) == 2:
+                    prefix = f"data.{labels[0]}.{labels[1]}."
+                elif kind == 'variable' and len(labels) == 1:
+                    prefix = f"var.{labels[0]}"
+                elif kind == 'locals' and not labels:
+                    prefix = "local."
+                else:
+                    prefix = None
+                depth = 1
+                header = []
+                statement = []
+            elif ch == '\n':
+                header = []
+            else:
+                header.append(ch)
+        elif ch in '{[(':
+            depth += 1
+            statement.append(ch)
+        elif ch in '}])':
+            depth -= 1
+            if depth == 0:
+                if prefix:
+                    _store(symbols, prefix, ''.join(statement))
+                prefix = None
+                statement = []
+            else:
+                statement.append(ch)
+        elif ch == '\n' and depth == 1:
+            if prefix:
+                _store(symbols, prefix, ''.join(statement))
+            statement = []
+        else:
+            statement.append(ch)
+        i += 1
+
+    return symbols
+
+
+def _resolve(symbols: dict, reference: str, seen: tuple, allow_expression: bool = False):
+    """Follow a chain of references through the symbol table
+
+    Unquoted values that are not a plain reference (function calls, index
+    expressions, maps) cannot be evaluated here and resolve to None, unless
+    allow_expression asks for their raw text.
+    """
+    if reference in seen:
+        print(f"  ✗ Reference cycle: {' -> '.join(seen + (reference,))}")
+        return None
+    if reference not in symbols:
+        print(f"  ✗ {reference} is not in the symbol table")
+        return None
+
+    value, is_literal = symbols[reference]
+    seen = seen + (reference,)
+    print(f"  {reference} = {value!r}{'' if is_literal else ' (expression)'}")
+
+    if not is_literal and REFERENCE_PATTERN.match(value):
+        return _resolve(symbols, value, seen, allow_expression)
+
+    if not is_literal and not allow_expression:
+        print(f"  ✗ {reference} is an expression, not a static value")
+        return None
+
+    failed = []
+
+    def substitute(match):
+        resolved = _resolve(symbols, match.group(1).strip(), seen)
+        if resolved is None:
+            failed.append(match.group(1))
+            return match.group(0)
+        return resolved
+
+    value = INTERPOLATION_PATTERN.sub(substitute, value)
+    return None if failed else value
+
+
+def _resolve_terraform_value(terraform_code: str, reference: str, symbols: Optional[dict] = None,
+                             allow_expression: bool = False):
+    """Resolve a reference via the symbol table instead of per-reference regexes
+
+    Pass allow_expression=True to get the raw text of expression values such
+    as a tags map; otherwise only static values resolve.
+    """
+    if not reference or not isinstance(reference, str):
+        return None
+
+    reference_str = str(reference).strip()
+    print(f"\n🔍 Resolving: {reference_str}")
+
+    # Build the table once per document and pass it in for repeated lookups
+    if symbols is None:
+        symbols = _build_symbol_table(terraform_code)
+        print(f"  Built symbol table with {len(symbols)} entries")
+
+    if reference_str.startswith('${') and reference_str.endswith('}'):
+        reference_str = reference_str[2:-1].strip()
+
+    value = _resolve(symbols, reference_str, (), allow_expression)
+    if value is not None:
+        print(f"  ✓ RESOLVED! Value: {value}")
+    else:
+        print(f"  ✗ UNRESOLVED")
+    return value
+
 # Test terraform code
-terraform = '''resource "azurerm_resource_group" "main" {
+terraform = '''variable "project_name" {
+  description = "Project prefix"
+  default     = "infrapilot"
+}
+
+variable "region" { default = "westus" }
+
+locals {
+  region = azurerm_resource_group.main.location
+  loop_a = local.loop_b
+  loop_b = local.loop_a
+}
+
+resource "azurerm_resource_group" "main" {
   name     = "${var.project_name}-rg"
   location = "eastus"
 }
@@ -89,7 +327,7 @@ resource "azurerm_subnet" "internal" {
 
 resource "azurerm_network_interface" "main" {
   name                = "${var.project_name}-nic"
-  location            = azurerm_resource_group.main.location
+  location            = local.region
   resource_group_name = azurerm_resource_group.main.name
 
   ip_configuration {
@@ -97,6 +335,28 @@ resource "azurerm_network_interface" "main" {
     subnet_id                     = azurerm_subnet.internal.id
     private_ip_address_allocation = "Dynamic"
   }
+}
+
+resource "azurerm_public_ip" "main" {
+  name     = "${var.project_name}-pip"
+  location = coalesce(var.region, "eastus")
+  zone     = azurerm_subnet.internal[0].location
+}
+
+resource "azurerm_dns_zone" "main" {
+  name                = "contoso.com"
+  resource_group_name = azurerm_resource_group.main.name
+}
+
+/* resource "aws_instance" "old" {
+  instance_type = "t2.micro"
+} */
+
+resource "aws_instance" "web" {
+  instance_type = "t3.micro"
+  tags = {
+    Name = "web"
+  }
 }'''
 
 print("=" * 80)
@@ -109,6 +369,26 @@ print("\n" + "=" * 80)
 print("TEST EXTRACTIONS:")
 print("=" * 80)
 
-reference = "azurerm_resource_group.main.location"
-result = _extract_terraform_value(terraform, reference)
-print(f"\n✅ FINAL RESULT: {result}")
+symbol_table = _build_symbol_table(terraform)
+print(f"\nSymbol table: {len(symbol_table)} entries")
+
+for reference in [
+    "azurerm_resource_group.main.location",
+    "azurerm_network_interface.main.location",
+    "azurerm_subnet.internal.resource_group_name",
+    "azurerm_dns_zone.main.name",
+    "aws_instance.web.instance_type",
+    "azurerm_public_ip.main.location",
+    "azurerm_public_ip.main.zone",
+    "var.region",
+    "local.loop_a",
+]:
+    regex_result = _extract_terraform_value(terraform, reference)
+    table_result = _resolve_terraform_value(terraform, reference, symbol_table)
+    print(f"\n✅ FINAL RESULT: regex={regex_result!r} symbol_table={table_result!r}")
+
+# Raw expression text is only returned when explicitly requested
+for reference in ["aws_instance.web.tags"]:
+    regex_result = _extract_terraform_value(terraform, reference)
+    table_result = _resolve_terraform_value(terraform, reference, symbol_table, allow_expression=True)
+    print(f"\n✅ FINAL RESULT: regex={regex_result!r} symbol_table={table_result!r}")